@@ -1,6 +1,6 @@
 """
 Airflow DAG to orchestrate a full dbt pipeline using Astro CLI-integrated containers.
-Steps include installing dbt dependencies, seeding, snapshots, source freshness check,
+Steps include installing dbt dependencies, seeding, staging, snapshots, source freshness check,
 model runs, tests, Elementary data quality run, and publishing reports to GCS.
 """
 
@@ -54,6 +54,11 @@ def run_dbt_seed():
     run_dbt_command(['dbt', 'seed'])
 
 
+def run_dbt_staging():
+    """Refresh the incremental staging layer before snapshots read from it."""
+    run_dbt_command(['dbt', 'run', '--select', 'path:models/staging'])
+
+
 def run_dbt_snapshot():
     """Run snapshot logic for slowly changing dimensions."""
     run_dbt_command(['dbt', 'snapshot'])
@@ -158,9 +163,11 @@ with DAG(
     # Task definitions
     deps_task = PythonOperator(task_id='dbt_deps', python_callable=run_dbt_deps)
     seed_task = PythonOperator(task_id='dbt_seed', python_callable=run_dbt_seed)
-    snapshot_task = PythonOperator(task_id='dbt_snapshot', python_callable=run_dbt_snapshot)
+    staging_task = PythonOperator(task_id='dbt_run_staging', python_callable=run_dbt_staging, pool='lapd_snowflake_merge')
+    # Snapshot and run share the micro-batch DAG's pool so they never MERGE concurrently with a batch
+    snapshot_task = PythonOperator(task_id='dbt_snapshot', python_callable=run_dbt_snapshot, pool='lapd_snowflake_merge')
     source_freshness_task = PythonOperator(task_id='dbt_source_freshness', python_callable=run_dbt_source_freshness)
-    run_task = PythonOperator(task_id='dbt_run', python_callable=run_dbt_run)
+    run_task = PythonOperator(task_id='dbt_run', python_callable=run_dbt_run, pool='lapd_snowflake_merge')
     test_task = PythonOperator(task_id='dbt_test', python_callable=run_dbt_test)
     elementary_task = PythonOperator(task_id='dbt_elementary_run', python_callable=run_dbt_elementary)
     send_edr_report_to_gcs = PythonOperator(task_id='send_edr_report_to_gcs', python_callable=send_edr_report_to_gcs)
@@ -168,4 +175,4 @@ with DAG(
     upload_docs_task = PythonOperator(task_id='upload_dbt_docs_to_gcs', python_callable=upload_dbt_docs_to_gcs)
 
     # DAG task sequence
-    deps_task >> seed_task >> snapshot_task >> source_freshness_task >> run_task >> test_task >> elementary_task >> send_edr_report_to_gcs >> generate_docs_task >> upload_docs_task
+    deps_task >> seed_task >> staging_task >> snapshot_task >> source_freshness_task >> run_task >> test_task >> elementary_task >> send_edr_report_to_gcs >> generate_docs_task >> upload_docs_task
@@ -0,0 +1,178 @@
+"""
+Airflow DAG that runs the pipeline in event-driven micro-batches.
+A deferrable sensor watches the GCS landing prefix; newly landed CSV files are loaded into
+Snowflake by the loader script, archived, and then only staging, the incremental core models
+and the reporting marts are refreshed with dbt. The DAG runs continuously with a single active run,
+and the loader/dbt tasks share a one-slot pool with the full `dbt_run` DAG so that batches
+never MERGE into the same targets concurrently.
+"""
+
+from airflow import DAG
+from airflow.operators.python import PythonOperator, ShortCircuitOperator
+from airflow.providers.google.cloud.sensors.gcs import GCSObjectsWithPrefixExistenceSensor
+import pendulum
+import subprocess
+import logging
+import os
+
+# GCS landing zone watched by the sensor; processed files are moved to the archive prefix
+# and anything that is not a CSV (e.g. folder placeholders) to the rejected prefix
+GCS_BUCKET_NAME = os.environ.get('GCS_BUCKET_NAME', 'lapd-crime-data')
+LANDING_PREFIX = os.environ.get('LAPD_LANDING_PREFIX', 'landing/')
+ARCHIVE_PREFIX = os.environ.get('LAPD_ARCHIVE_PREFIX', 'archive/')
+REJECTED_PREFIX = os.environ.get('LAPD_REJECTED_PREFIX', 'rejected/')
+
+# Pool (1 slot) shared with the dbt_run DAG to serialize writes to the MERGE targets
+SNOWFLAKE_MERGE_POOL = 'lapd_snowflake_merge'
+
+VENV_BIN_PATH = '/usr/local/airflow/dbt_venv/bin'
+LOADER_SCRIPT = '/usr/local/airflow/scripts/load_lapd_csv_to_snowflake.py'
+
+# Default DAG arguments
+default_args = {
+    'owner': 'lapd_crime_project',
+    'retries': 0
+}
+
+
+def run_command(command, cwd=None):
+    """
+    Runs a CLI command and raises if it fails, so the batch stops at the failing step.
+    Args:
+        command (list): The command to run, e.g., ['dbt', 'run']
+        cwd (str): Working directory for the command.
+    """
+    log = logging.getLogger(__name__)
+    log.info(f"Running command: {' '.join(command)}")
+
+    try:
+        result = subprocess.run(
+            command,
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        log.info(f"Command output:\n{result.stdout}")
+    except subprocess.CalledProcessError as e:
+        log.error(f"Command failed: {e.cmd}\nSTDOUT:\n{e.stdout}\nSTDERR:\n{e.stderr}")
+        raise
+
+
+def run_dbt_command(command):
+    """
+    Runs a specified dbt CLI command inside the containerized environment.
+    Args:
+        command (list): The dbt command to run, e.g., ['dbt', 'run']
+    """
+    env = os.environ.copy()
+    command[0] = os.path.join(VENV_BIN_PATH, 'dbt')  # Override with venv path
+    run_command(command, cwd=env.get('DBT_WORKING_DIR', '/usr/local/airflow/dbt/lapd_crime_project'))
+
+
+def get_landed_objects(ti):
+    """Return all object names found by the landing sensor."""
+    return ti.xcom_pull(task_ids='wait_for_landed_files') or []
+
+
+def get_landed_files(ti):
+    """Return the CSV object names found by the landing sensor."""
+    return sorted(name for name in get_landed_objects(ti) if name.lower().endswith('.csv'))
+
+
+def move_landed_objects(object_names, destination_prefix):
+    """Move objects from the landing prefix to the given prefix in the same bucket."""
+    from google.cloud import storage
+
+    log = logging.getLogger(__name__)
+    storage_client = storage.Client()
+    bucket = storage_client.bucket(GCS_BUCKET_NAME)
+
+    for object_name in object_names:
+        blob = bucket.blob(object_name)
+        destination_path = destination_prefix + object_name[len(LANDING_PREFIX):]
+        bucket.copy_blob(blob, bucket, destination_path)
+        blob.delete()
+        log.info(f"Moved gs://{GCS_BUCKET_NAME}/{object_name} to gs://{GCS_BUCKET_NAME}/{destination_path}")
+
+
+def check_landed_files(ti):
+    """
+    Short-circuit the batch when no CSV files landed. The sensor matches any object
+    under the landing prefix, so non-CSV objects are moved to the rejected prefix;
+    otherwise they would wake the sensor again on every continuous run.
+    """
+    log = logging.getLogger(__name__)
+    file_paths = get_landed_files(ti)
+    other_objects = [name for name in get_landed_objects(ti) if name not in file_paths]
+    if other_objects:
+        move_landed_objects(other_objects, REJECTED_PREFIX)
+    if not file_paths:
+        log.info("No CSV files in the landing prefix; skipping the batch.")
+        return False
+    return True
+
+
+def load_landed_files(ti):
+    """Load the newly landed CSV files into the raw table via the loader script."""
+    file_paths = get_landed_files(ti)
+    command = [os.path.join(VENV_BIN_PATH, 'python'), LOADER_SCRIPT]
+    for file_path in file_paths:
+        command.extend(['--gcs-file-path', file_path])
+    run_command(command)
+
+
+def archive_landed_files(ti):
+    """
+    Move loaded files from the landing prefix to the archive prefix so that the
+    sensor only fires for files that have not been processed yet.
+    """
+    move_landed_objects(get_landed_files(ti), ARCHIVE_PREFIX)
+
+
+def run_dbt_staging():
+    """Refresh the incremental staging layer that the snapshot and marts read from."""
+    run_dbt_command(['dbt', 'run', '--select', 'path:models/staging'])
+
+
+def run_dbt_snapshot():
+    """Run snapshot logic for slowly changing dimensions."""
+    run_dbt_command(['dbt', 'snapshot'])
+
+
+def run_dbt_micro_batch():
+    """Run the incremental core models and reporting marts."""
+    run_dbt_command(['dbt', 'run', '--selector', 'micro_batch'])
+
+
+# Define the DAG
+with DAG(
+        dag_id='lapd_micro_batch',
+        default_args=default_args,
+        description='Load newly landed GCS files and refresh incremental core and reporting models',
+        schedule='@continuous',  # A new run starts as soon as the previous one finishes
+        max_active_runs=1,  # Required by @continuous; prevents overlapping batches
+        start_date=pendulum.now().subtract(days=1),
+        catchup=False,
+        tags=['dbt', 'micro_batch']
+) as dag:
+    # Task definitions
+    wait_for_files_task = GCSObjectsWithPrefixExistenceSensor(
+        task_id='wait_for_landed_files',
+        bucket=GCS_BUCKET_NAME,
+        prefix=LANDING_PREFIX,
+        deferrable=True,  # Polls from the triggerer, so no worker slot is held while idle
+        poke_interval=60,
+        timeout=60 * 60 * 6,
+        soft_fail=True  # Skip the batch instead of failing when nothing lands
+    )
+    # Skips every downstream task when nothing loadable landed, so idle runs never reach Snowflake
+    check_files_task = ShortCircuitOperator(task_id='check_landed_files', python_callable=check_landed_files)
+    load_task = PythonOperator(task_id='load_landed_files', python_callable=load_landed_files, pool=SNOWFLAKE_MERGE_POOL)
+    archive_task = PythonOperator(task_id='archive_landed_files', python_callable=archive_landed_files)
+    staging_task = PythonOperator(task_id='dbt_run_staging', python_callable=run_dbt_staging, pool=SNOWFLAKE_MERGE_POOL)
+    snapshot_task = PythonOperator(task_id='dbt_snapshot', python_callable=run_dbt_snapshot, pool=SNOWFLAKE_MERGE_POOL)
+    run_task = PythonOperator(task_id='dbt_run_micro_batch', python_callable=run_dbt_micro_batch, pool=SNOWFLAKE_MERGE_POOL)
+
+    # DAG task sequence
+    wait_for_files_task >> check_files_task >> load_task >> archive_task >> staging_task >> snapshot_task >> run_task
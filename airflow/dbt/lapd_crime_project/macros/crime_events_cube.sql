@@ -0,0 +1,49 @@
+{#-
+    Incremental maintenance of int_crime_events_cube and the reporting marts built from it.
+
+    int_crime_events_cube_changes is an append-only log of occurrence months to recompute,
+    each entry stamped with dlu and carrying the partition keys the cube held for the month
+    when it was written. Every consumer reads the entries newer than its own MAX(dlu), so a
+    consumer that missed runs catches up on its next one. A consumer clears the partitions
+    those entries touch in a pre-hook and appends them rebuilt, so partitions left without
+    events do not keep stale rows. Touched partitions are the keys recorded in the entries
+    (old state) plus the keys the cube holds now for their months (new state).
+
+    The cube stamps its rows with the build time; marts stamp the cube's MAX(dlu) they were
+    built from, so entries the cube has not consumed yet are read again on the next run.
+    The watermark is read once, before the pre-hook delete can remove the rows holding it,
+    and inlined so the delete and the select agree on the same entries.
+-#}
+
+{% macro cube_changes_watermark() -%}
+    {%- set watermark = none -%}
+    {%- if execute and is_incremental() -%}
+        {%- set result = run_query('SELECT DATE_PART(epoch_nanosecond, MAX(dlu)) FROM ' ~ this) -%}
+        {%- set watermark = result.columns[0].values()[0] -%}
+    {%- endif -%}
+    TO_TIMESTAMP_LTZ({{ watermark if watermark is not none else 0 }}, 9)
+{%- endmacro %}
+
+{% macro cube_changed_months() -%}
+    SELECT occ_month
+    FROM {{ ref('int_crime_events_cube_changes') }}
+    WHERE dlu > {{ cube_changes_watermark() }}
+{%- endmacro %}
+
+{% macro cube_touched_keys(columns) -%}
+    SELECT {{ columns | join(', ') }}
+    FROM {{ ref('int_crime_events_cube') }}
+    WHERE occ_month IN ({{ cube_changed_months() }})
+    UNION
+    SELECT {{ columns | join(', ') }}
+    FROM {{ ref('int_crime_events_cube_changes') }}
+    WHERE dlu > {{ cube_changes_watermark() }}
+{%- endmacro %}
+
+{#- Marts: cube_columns names the matching cube columns when the model renames them -#}
+{% macro delete_cube_partitions(columns, cube_columns=none) -%}
+    {% if is_incremental() %}
+    DELETE FROM {{ this }}
+    WHERE ({{ columns | join(', ') }}) IN ({{ cube_touched_keys(cube_columns or columns) }})
+    {% endif %}
+{%- endmacro %}
@@ -0,0 +1,27 @@
+{#-
+    High-water mark for snapshots that read only new staging rows.
+    A check-strategy snapshot leaves unchanged rows untouched, so its own source_dlu
+    does not advance; the watermark is kept in a one-row <snapshot>_watermark table
+    written by the snapshot's post-hooks instead.
+-#}
+
+{% macro snapshot_watermark_relation(snapshot_relation) -%}
+    {{ return(api.Relation.create(
+        database=snapshot_relation.database,
+        schema=snapshot_relation.schema,
+        identifier=snapshot_relation.identifier ~ '_watermark'
+    )) }}
+{%- endmacro %}
+
+{% macro create_snapshot_watermark(snapshot_relation, source_relation, watermark_column) -%}
+    create table if not exists {{ snapshot_watermark_relation(snapshot_relation) }} as
+    select max({{ watermark_column }}) as source_dlu
+    from {{ source_relation }}
+    where false
+{%- endmacro %}
+
+{% macro update_snapshot_watermark(snapshot_relation, source_relation, watermark_column) -%}
+    insert overwrite into {{ snapshot_watermark_relation(snapshot_relation) }}
+    select max({{ watermark_column }})
+    from {{ source_relation }}
+{%- endmacro %}
@@ -0,0 +1,15 @@
+{#-
+    Surrogate keys shared by dimensions and the fact table.
+    Both sides must hash the same natural columns, in the same order and with the same
+    null handling (dbt_utils.generate_surrogate_key), so the fact can derive the key
+    from staging instead of joining back to the dimension.
+-#}
+
+{% macro victim_key(age, sex, descent) -%}
+    {{ dbt_utils.generate_surrogate_key([age, sex, descent]) }}
+{%- endmacro %}
+
+{#- Natural key only: lat/lon are tracked attributes of the dim_location snapshot -#}
+{% macro location_key(location, cross_street) -%}
+    {{ dbt_utils.generate_surrogate_key([location, cross_street]) }}
+{%- endmacro %}
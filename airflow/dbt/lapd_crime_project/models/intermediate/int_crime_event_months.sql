@@ -0,0 +1,19 @@
+{{ config(
+    materialized='incremental',
+    incremental_strategy='append',
+    on_schema_change='sync_all_columns'
+) }}
+
+-- Occurrence month of a crime event, appended every time the event is merged into the fact,
+-- so int_crime_events_cube_changes can recompute every month an event has held
+SELECT
+    fce.dr_no,
+    DATE_TRUNC('month', dd.full_date) AS occ_month,
+    CURRENT_TIMESTAMP() AS dlu
+FROM {{ ref('fct_crime_events') }} AS fce
+JOIN {{ ref('dim_date') }} AS dd
+    ON fce.date_occ_id = dd.id
+
+{% if is_incremental() %}
+WHERE fce.dlu > (SELECT MAX(dlu) FROM {{ this }})
+{% endif %}
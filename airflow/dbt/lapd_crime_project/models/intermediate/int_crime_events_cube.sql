@@ -0,0 +1,77 @@
+{{ config(
+    materialized='incremental',
+    incremental_strategy='append',
+    cluster_by=['occ_month'],
+    on_schema_change='sync_all_columns',
+    pre_hook="{% if is_incremental() %}DELETE FROM {{ this }} WHERE occ_month IN ({{ cube_changed_months() }}){% endif %}"
+) }}
+
+-- depends_on: {{ ref('int_crime_events_cube_changes') }}
+
+-- Shared pre-aggregation for the reporting marts, built in one pass over the fact.
+-- Partition key: occ_month (see crime_events_cube.sql).
+WITH events AS (
+    SELECT
+        fce.dr_no,
+        DATE_TRUNC('month', dd.full_date) AS occ_month,
+        dd.year,
+        dd.month,
+        dd.month_name,
+        fce.area_dim_id,
+        fce.weapons_id,
+        fce.premis_dim_id,
+        fce.time_occ_id,
+        fce.location_dim_id
+    FROM {{ ref('fct_crime_events') }} AS fce
+    JOIN {{ ref('dim_date') }} AS dd
+        ON fce.date_occ_id = dd.id
+
+    {% if is_incremental() %}
+    WHERE DATE_TRUNC('month', dd.full_date) IN ({{ cube_changed_months() }})
+    {% endif %}
+),
+event_codes AS (
+    SELECT
+        e.*,
+        bcc.crime_code_dim_id,
+        -- one row per event carries the event, so event_count sums correctly across crime codes
+        IFF(ROW_NUMBER() OVER (PARTITION BY e.dr_no ORDER BY bcc.crime_code_dim_id) = 1, 1, 0) AS is_event_row
+    FROM events AS e
+    LEFT JOIN {{ ref('bridge_crime_code') }} AS bcc
+        ON e.dr_no = bcc.dr_no
+)
+
+SELECT
+    ec.occ_month,
+    ec.year,
+    ec.month,
+    ec.month_name,
+    da.code AS area_code,
+    da.name AS area_name,
+    dc.code AS crime_code,
+    dc.description AS crime_description,
+    dw.code AS weapon_code,
+    dw.description AS weapon_description,
+    dp.code AS premise_code,
+    dp.description AS premise_description,
+    dt.part_of_day AS time_of_day,
+    ROUND(dl.lat, 3) AS lat_bucket,
+    ROUND(dl.lon, 3) AS lon_bucket,
+    SUM(ec.is_event_row) AS event_count,
+    COUNT(ec.crime_code_dim_id) AS crime_code_count,
+    CURRENT_TIMESTAMP AS dlu
+FROM event_codes AS ec
+LEFT JOIN {{ ref('dim_area') }} AS da
+    ON ec.area_dim_id = da.id
+LEFT JOIN {{ ref('dim_crime_code') }} AS dc
+    ON ec.crime_code_dim_id = dc.id
+LEFT JOIN {{ ref('dim_weapon') }} AS dw
+    ON ec.weapons_id = dw.id
+LEFT JOIN {{ ref('dim_premise') }} AS dp
+    ON ec.premis_dim_id = dp.id
+LEFT JOIN {{ ref('dim_time') }} AS dt
+    ON ec.time_occ_id = dt.id
+LEFT JOIN {{ ref('dim_location') }} AS dl
+    ON ec.location_dim_id = dl.id
+   AND dl.dbt_valid_to IS NULL
+GROUP BY 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15
@@ -0,0 +1,113 @@
+{{ config(
+    materialized='incremental',
+    incremental_strategy='append',
+    cluster_by=['dlu'],
+    on_schema_change='sync_all_columns'
+) }}
+
+-- Append-only change log of the cube: occurrence months to recompute, with the partition
+-- keys the cube held for them when the entry was written. Read through the macros in
+-- crime_events_cube.sql; the cube itself is looked up, not referenced, as it is built from this log.
+{% set cube = adapter.get_relation(this.database, this.schema, 'int_crime_events_cube') %}
+{#- (dimension, its name column, cube code column, cube name column) copied into the cube -#}
+{% set named_dimensions = [
+    ('dim_area', 'name', 'area_code', 'area_name'),
+    ('dim_crime_code', 'description', 'crime_code', 'crime_description'),
+    ('dim_weapon', 'description', 'weapon_code', 'weapon_description'),
+    ('dim_premise', 'description', 'premise_code', 'premise_description')
+] %}
+
+WITH changed_events AS (
+    SELECT
+        dr_no,
+        occ_month
+    FROM {{ ref('int_crime_event_months') }}
+
+    {% if is_incremental() %}
+    WHERE dlu > (SELECT MAX(dlu) FROM {{ this }})
+    {% endif %}
+),
+changed_months AS (
+    SELECT occ_month
+    FROM changed_events
+
+    {% if is_incremental() %}
+    UNION
+    -- the month each changed event held before, which the cube still counts it in
+    SELECT occ_month
+    FROM {{ ref('int_crime_event_months') }}
+    WHERE dlu <= (SELECT MAX(dlu) FROM {{ this }})
+      AND dr_no IN (SELECT dr_no FROM changed_events)
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY dr_no ORDER BY dlu DESC) = 1
+
+    UNION
+    -- events at locations that opened a new dim_location version move to another grid cell;
+    -- a version's dlu is the snapshot run that inserted it
+    SELECT DATE_TRUNC('month', dd.full_date)
+    FROM {{ ref('fct_crime_events') }} AS fce
+    JOIN {{ ref('dim_date') }} AS dd
+        ON fce.date_occ_id = dd.id
+    WHERE fce.location_dim_id IN (
+        SELECT id
+        FROM {{ ref('dim_location') }}
+        WHERE dlu > (SELECT MAX(dlu) FROM {{ this }})
+    )
+
+    {% if cube is not none %}
+    {% for dimension, name_column, cube_code, cube_name in named_dimensions %}
+    UNION
+    -- months whose {{ cube_code }} names differ from the current {{ dimension }} rows
+    SELECT COALESCE(held.occ_month, expected.occ_month)
+    FROM (
+        SELECT DISTINCT occ_month, {{ cube_code }} AS code, {{ cube_name }} AS name
+        FROM {{ cube }}
+        WHERE {{ cube_code }} IN (
+            SELECT code
+            FROM {{ ref(dimension) }}
+            WHERE dlu > (SELECT MAX(dlu) FROM {{ this }})
+        )
+    ) AS held
+    FULL OUTER JOIN (
+        SELECT DISTINCT held_codes.occ_month, dim.code, dim.{{ name_column }} AS name
+        FROM (
+            SELECT DISTINCT occ_month, {{ cube_code }} AS code
+            FROM {{ cube }}
+        ) AS held_codes
+        JOIN {{ ref(dimension) }} AS dim
+            ON held_codes.code = dim.code
+        WHERE dim.dlu > (SELECT MAX(dlu) FROM {{ this }})
+    ) AS expected
+        ON held.occ_month = expected.occ_month
+       AND held.code = expected.code
+       AND EQUAL_NULL(held.name, expected.name)
+    WHERE held.occ_month IS NULL
+       OR expected.occ_month IS NULL
+    {% endfor %}
+    {% endif %}
+    {% endif %}
+)
+
+SELECT DISTINCT
+    cm.occ_month,
+    YEAR(cm.occ_month) AS year,
+    MONTH(cm.occ_month) AS month,
+    {% if cube is not none %}
+    cube_data.area_name,
+    cube_data.crime_code,
+    cube_data.time_of_day,
+    cube_data.lat_bucket,
+    cube_data.lon_bucket,
+    {% else %}
+    -- first build: the cube does not exist yet and holds no partitions
+    CAST(NULL AS VARCHAR) AS area_name,
+    CAST(NULL AS INT) AS crime_code,
+    CAST(NULL AS VARCHAR) AS time_of_day,
+    CAST(NULL AS FLOAT) AS lat_bucket,
+    CAST(NULL AS FLOAT) AS lon_bucket,
+    {% endif %}
+    CURRENT_TIMESTAMP AS dlu
+FROM changed_months AS cm
+{% if cube is not none %}
+LEFT JOIN {{ cube }} AS cube_data
+    ON cm.occ_month = cube_data.occ_month
+{% endif %}
@@ -13,7 +13,7 @@ WITH source_data AS (
         CURRENT_TIMESTAMP() AS load_time
     FROM
         {{ ref('stg_lapd_crime_data') }} AS src
-    CROSS JOIN LATERAL FLATTEN(input => ARRAY_CONSTRUCT(src.crm_cd_1, src.crm_cd_2, src.crm_cd_3, src.crm_cd_4)) AS flattened_crime_code
+    CROSS JOIN LATERAL FLATTEN(input => src.crime_code_array) AS flattened_crime_code
     LEFT JOIN {{ ref('dim_crime_code') }} AS dim
         ON flattened_crime_code.value = dim.code
     WHERE dim.id IS NOT NULL
@@ -13,7 +13,7 @@ WITH source_data AS (
         CURRENT_TIMESTAMP() AS load_time
     FROM
         {{ ref('stg_lapd_crime_data') }} AS src
-    LEFT JOIN LATERAL FLATTEN(input => SPLIT(src.mocodes, ' ')) AS flattened_mocode
+    LEFT JOIN LATERAL FLATTEN(input => src.mocode_array) AS flattened_mocode
     WHERE flattened_mocode.value IS NOT NULL
     {% if is_incremental() %}
       AND src.dl_upd > (SELECT MAX(dlu) FROM {{ this }})
@@ -38,7 +38,7 @@ LEFT JOIN descent_mapping dm
     ON sv.vict_descent = dm.descent_code
 )
 SELECT
-    {{ dbt_utils.generate_surrogate_key(['age','sex','descent']) }} AS id,
+    {{ victim_key('age', 'sex', 'descent') }} AS id,
     age,
     sex,
     descent,
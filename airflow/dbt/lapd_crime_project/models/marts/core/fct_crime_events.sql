@@ -6,18 +6,22 @@
     on_schema_change = 'sync_all_columns'
 ) }}
 
+-- Keys are hashed rather than joined; keep the lineage to their dimensions
+-- depends_on: {{ ref('dim_victim') }}
+-- depends_on: {{ ref('dim_location') }}
+
 WITH source_data AS (
     SELECT
         src.dr_no,
         date_occ_dim.id     AS date_occ_id,
         date_rptd_dim.id    AS date_rptd_id,
         time_occ_dim.id     AS time_occ_id,
-        victim_dim.id       AS victims_id,
+        {{ victim_key('src.vict_age', 'src.vict_sex', 'descent_map.descent_description') }} AS victims_id,
         weapon_dim.id       AS weapons_id,
         status_dim.id       AS status_dim_id,
         area_dim.id         AS area_dim_id,
         premise_dim.id      AS premis_dim_id,
-        location_dim.id     AS location_dim_id,
+        {{ location_key('src.location', 'src.cross_street') }} AS location_dim_id,
         CURRENT_TIMESTAMP   AS load_time
     FROM {{ ref('stg_lapd_crime_data') }} AS src
     LEFT JOIN {{ ref('dim_date') }} AS date_occ_dim
@@ -27,19 +31,10 @@ WITH source_data AS (
     LEFT JOIN {{ ref('dim_time') }} AS time_occ_dim
         ON EXTRACT(HOUR FROM src.time_occ) = time_occ_dim.hour_of_day
         AND EXTRACT(MINUTE FROM src.time_occ) = time_occ_dim.minute_of_hour
-    LEFT JOIN (
-        SELECT
-            vd.id,
-            vd.age,
-            vd.sex,
-            dm.descent_code
-        FROM {{ ref('dim_victim') }} AS vd
-        LEFT JOIN {{ ref('descent_mapping') }} AS dm
-            ON vd.descent = dm.descent_description
-    ) AS victim_dim
-        ON IFNULL(src.vict_age, -1) = IFNULL(victim_dim.age, -1)
-        AND IFNULL(src.vict_sex, 'NA') = IFNULL(victim_dim.sex, 'NA')
-        AND IFNULL(src.vict_descent, 'NA') = IFNULL(victim_dim.descent_code, 'NA')
+    -- victims_id and location_dim_id are hashed from staging with the same macros as
+    -- dim_victim and dim_location; only the descent code needs its description
+    LEFT JOIN {{ ref('descent_mapping') }} AS descent_map
+        ON src.vict_descent = descent_map.descent_code
     LEFT JOIN {{ ref('dim_weapon') }} AS weapon_dim
         ON src.weapon_used_cd = weapon_dim.code
     LEFT JOIN {{ ref('dim_status') }} AS status_dim
@@ -48,11 +43,6 @@ WITH source_data AS (
         ON src.area = area_dim.code
     LEFT JOIN {{ ref('dim_premise') }} AS premise_dim
         ON src.premis_cd = premise_dim.code
-    LEFT JOIN {{ ref('dim_location') }} AS location_dim
-        ON IFNULL(src.location, 'NA') = IFNULL(location_dim.location, 'NA')
-        AND IFNULL(src.cross_street, 'NA') = IFNULL(location_dim.cross_street, 'NA')
-        AND IFNULL(src.lat, 0.0) = IFNULL(location_dim.lat, 0.0)
-        AND IFNULL(src.lon, 0.0) = IFNULL(location_dim.lon, 0.0)
 
     {% if is_incremental() %}
         WHERE src.dl_upd > (SELECT MAX(dlu) FROM {{ this }})
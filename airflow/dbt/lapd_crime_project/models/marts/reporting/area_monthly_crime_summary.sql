@@ -1,28 +1,37 @@
 {{ config(
-    materialized='table',
+    materialized='incremental',
     schema='mart_reporting',
-    tags=['reporting', 'summary']
+    incremental_strategy='append',
+    cluster_by=['year', 'month'],
+    on_schema_change='sync_all_columns',
+    tags=['reporting', 'summary'],
+    pre_hook="{{ delete_cube_partitions(['year', 'month']) }}"
 ) }}
 
+-- depends_on: {{ ref('int_crime_events_cube_changes') }}
+
+-- Partition key: year, month (see crime_events_cube.sql)
+WITH area_months AS (
+    SELECT
+        area_code,
+        area_name,
+        year,
+        month,
+        SUM(event_count) AS crime_count
+    FROM {{ ref('int_crime_events_cube') }}
+
+    {% if is_incremental() %}
+    WHERE occ_month IN ({{ cube_changed_months() }})
+    {% endif %}
+
+    GROUP BY 1, 2, 3, 4
+)
+
 SELECT
-    area_dim.code AS area_code,
-    area_dim.name AS area_name,
-    date_occ_dim.year AS year,
-    date_occ_dim.month AS month,
-    COUNT(*) AS crime_count,
-    CURRENT_TIMESTAMP AS dlu
-FROM {{ ref('fct_crime_events') }} AS fact
-LEFT JOIN {{ ref('dim_date') }} AS date_occ_dim
-    ON fact.date_occ_id = date_occ_dim.id
-LEFT JOIN {{ ref('dim_area') }} AS area_dim
-    ON fact.area_dim_id = area_dim.id
-GROUP BY
-    area_dim.code,
-    area_dim.name,
-    date_occ_dim.year,
-    date_occ_dim.month
-ORDER BY
-    area_dim.code,
-    area_dim.name,
-    date_occ_dim.year,
-    date_occ_dim.month
+    area_code,
+    area_name,
+    year,
+    month,
+    crime_count,
+    (SELECT MAX(dlu) FROM {{ ref('int_crime_events_cube') }}) AS dlu
+FROM area_months
@@ -1,21 +1,41 @@
 {{ config(
-    materialized='table',
+    materialized='incremental',
     schema='mart_reporting',
-    tags=['reporting', 'summary']
+    incremental_strategy='append',
+    cluster_by=['crime_code'],
+    on_schema_change='sync_all_columns',
+    tags=['reporting', 'summary'],
+    pre_hook="{{ delete_cube_partitions(['crime_code']) }}"
 ) }}
 
+-- depends_on: {{ ref('int_crime_events_cube_changes') }}
+
+-- Partition key: crime_code (see crime_events_cube.sql)
+WITH cube_data AS (
+    SELECT *
+    FROM {{ ref('int_crime_events_cube') }}
+    WHERE crime_code IS NOT NULL
+
+    {% if is_incremental() %}
+    AND crime_code IN (
+        {{ cube_touched_keys(['crime_code']) }}
+    )
+    {% endif %}
+),
+seasonality AS (
+    SELECT
+        crime_code,
+        crime_description,
+        month_name AS month,
+        month AS month_number,
+        SUM(crime_code_count) AS crime_count,
+        SUM(SUM(crime_code_count)) OVER (PARTITION BY crime_code) AS total_by_crime,
+        ROUND((SUM(crime_code_count) * 100.0) / SUM(SUM(crime_code_count)) OVER (PARTITION BY crime_code), 2) AS month_percentage
+    FROM cube_data
+    GROUP BY 1, 2, 3, 4
+)
+
 SELECT
-    dc.code AS crime_code,
-    dc.description AS crime_description,
-    dd.month_name AS month,
-    dd.month AS month_number,
-    COUNT(*) AS crime_count,
-    SUM(COUNT(*)) OVER (PARTITION BY dc.code) AS total_by_crime,
-    ROUND((COUNT(*) * 100.0) / SUM(COUNT(*)) OVER (PARTITION BY dc.code), 2) AS month_percentage
-FROM
-    {{ ref('bridge_crime_code') }} AS bcc
-    JOIN {{ ref('dim_crime_code') }} AS dc ON bcc.crime_code_dim_id = dc.id
-    JOIN {{ ref('fct_crime_events') }} AS fce ON bcc.dr_no = fce.dr_no
-    JOIN {{ ref('dim_date') }} AS dd ON fce.date_occ_id = dd.id
-GROUP BY 1, 2, 3, 4
-ORDER BY 1, 4
+    seasonality.*,
+    (SELECT MAX(dlu) FROM {{ ref('int_crime_events_cube') }}) AS dlu
+FROM seasonality
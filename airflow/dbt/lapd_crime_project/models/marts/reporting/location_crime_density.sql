@@ -1,26 +1,46 @@
 {{ config(
-    materialized='table',
+    materialized='incremental',
     schema='mart_reporting',
-    tags=['reporting', 'summary']
+    incremental_strategy='append',
+    cluster_by=['year', 'month_number', 'crime_code'],
+    on_schema_change='sync_all_columns',
+    tags=['reporting', 'summary'],
+    pre_hook="{{ delete_cube_partitions(['lat_bucket', 'lon_bucket']) }}"
 ) }}
 
-WITH crime_data AS (
+-- depends_on: {{ ref('int_crime_events_cube_changes') }}
+
+-- Partition key: lat_bucket, lon_bucket (see crime_events_cube.sql)
+WITH cube_data AS (
+    SELECT *
+    FROM {{ ref('int_crime_events_cube') }}
+    WHERE lat_bucket IS NOT NULL
+      AND lon_bucket IS NOT NULL
+      AND crime_code IS NOT NULL
+      AND time_of_day IS NOT NULL
+),
+{% if is_incremental() %}
+touched_grid AS (
+    {{ cube_touched_keys(['lat_bucket', 'lon_bucket']) }}
+),
+{% endif %}
+crime_data AS (
     SELECT
-        ROUND(dl.lat, 3) AS lat_bucket,
-        ROUND(dl.lon, 3) AS lon_bucket,
-        COUNT(*) AS crime_count,
-        dc.code AS crime_code,
-        dc.description AS crime_description,
-        dd.month_name AS month,
-        dd.year AS year,
-        dd.month AS month_number,
-        dt.part_of_day AS time_of_day
-    FROM {{ ref('fct_crime_events') }} AS fce
-    JOIN {{ ref('dim_location') }} AS dl ON fce.location_dim_id = dl.id
-    JOIN {{ ref('bridge_crime_code') }} AS bcc ON fce.dr_no = bcc.dr_no
-    JOIN {{ ref('dim_crime_code') }} AS dc ON bcc.crime_code_dim_id = dc.id
-    JOIN {{ ref('dim_date') }} AS dd ON fce.date_occ_id = dd.id
-    JOIN {{ ref('dim_time') }} AS dt ON fce.time_occ_id = dt.id
+        cube_data.lat_bucket,
+        cube_data.lon_bucket,
+        SUM(cube_data.crime_code_count) AS crime_count,
+        cube_data.crime_code,
+        cube_data.crime_description,
+        cube_data.month_name AS month,
+        cube_data.year,
+        cube_data.month AS month_number,
+        cube_data.time_of_day
+    FROM cube_data
+    {% if is_incremental() %}
+    JOIN touched_grid
+        ON cube_data.lat_bucket = touched_grid.lat_bucket
+       AND cube_data.lon_bucket = touched_grid.lon_bucket
+    {% endif %}
     GROUP BY 1,2,4,5,6,7,8,9
 )
 SELECT
@@ -35,7 +55,6 @@ SELECT
     time_of_day,
     crime_count,
     SUM(crime_count) OVER (PARTITION BY lat_bucket, lon_bucket) AS total_crimes_in_grid,
-    ROUND((crime_count * 100.0) / SUM(crime_count) OVER (PARTITION BY lat_bucket, lon_bucket), 2) AS crime_density_percentage
+    ROUND((crime_count * 100.0) / SUM(crime_count) OVER (PARTITION BY lat_bucket, lon_bucket), 2) AS crime_density_percentage,
+    (SELECT MAX(dlu) FROM {{ ref('int_crime_events_cube') }}) AS dlu
 FROM crime_data
-ORDER BY lat_bucket, lon_bucket, crime_code, year, month_number
-
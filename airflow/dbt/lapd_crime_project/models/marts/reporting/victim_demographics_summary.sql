@@ -25,4 +25,3 @@ FROM
     {{ ref('fct_crime_events') }} AS fce
     JOIN {{ ref('dim_victim') }} AS dv ON fce.victims_id = dv.id
 GROUP BY 1, 2, 3
-ORDER BY 1, 2, 3
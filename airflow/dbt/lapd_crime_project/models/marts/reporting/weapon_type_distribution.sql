@@ -1,20 +1,49 @@
 {{ config(
-    materialized='table',
+    materialized='incremental',
     schema='mart_reporting',
-    tags=['reporting', 'summary']
+    incremental_strategy='append',
+    cluster_by=['area_name', 'part_of_day'],
+    on_schema_change='sync_all_columns',
+    tags=['reporting', 'summary'],
+    pre_hook="{{ delete_cube_partitions(['area_name', 'part_of_day'], ['area_name', 'time_of_day']) }}"
 ) }}
 
+-- depends_on: {{ ref('int_crime_events_cube_changes') }}
+
+-- Partition key: area_name, part_of_day (see crime_events_cube.sql)
+WITH cube_data AS (
+    SELECT *
+    FROM {{ ref('int_crime_events_cube') }}
+    WHERE area_name IS NOT NULL
+      AND time_of_day IS NOT NULL
+      AND weapon_code IS NOT NULL
+),
+{% if is_incremental() %}
+touched_groups AS (
+    {{ cube_touched_keys(['area_name', 'time_of_day']) }}
+),
+{% endif %}
+weapon_data AS (
+    SELECT
+        cube_data.area_name,
+        cube_data.time_of_day AS part_of_day,
+        cube_data.weapon_description AS weapon_type,
+        SUM(cube_data.event_count) AS weapon_count
+    FROM cube_data
+    {% if is_incremental() %}
+    JOIN touched_groups
+        ON cube_data.area_name = touched_groups.area_name
+       AND cube_data.time_of_day = touched_groups.time_of_day
+    {% endif %}
+    GROUP BY 1, 2, 3
+)
+
 SELECT
-    da.name AS area_name,
-    dt.part_of_day,
-    dw.description AS weapon_type,
-    COUNT(*) AS weapon_count,
-    SUM(COUNT(*)) OVER (PARTITION BY da.name, dt.part_of_day) AS total_crimes,
-    ROUND((COUNT(*) * 100.0) / SUM(COUNT(*)) OVER (PARTITION BY da.name, dt.part_of_day), 2) AS weapon_type_percentage
-FROM
-    {{ ref('fct_crime_events') }} AS fce
-    JOIN {{ ref('dim_time') }} AS dt ON fce.time_occ_id = dt.id
-    JOIN {{ ref('dim_area') }} AS da ON fce.area_dim_id = da.id
-    JOIN {{ ref('dim_weapon') }} AS dw ON fce.weapons_id = dw.id
-GROUP BY 1, 2, 3
-ORDER BY 1, 2, 3
+    area_name,
+    part_of_day,
+    weapon_type,
+    weapon_count,
+    SUM(weapon_count) OVER (PARTITION BY area_name, part_of_day) AS total_crimes,
+    ROUND((weapon_count * 100.0) / SUM(weapon_count) OVER (PARTITION BY area_name, part_of_day), 2) AS weapon_type_percentage,
+    (SELECT MAX(dlu) FROM {{ ref('int_crime_events_cube') }}) AS dlu
+FROM weapon_data
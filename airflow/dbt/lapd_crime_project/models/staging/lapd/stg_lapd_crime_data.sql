@@ -1,8 +1,19 @@
-{{ config(materialized='view') }}
+{{ config(
+    materialized='incremental',
+    unique_key='dr_no',
+    incremental_strategy='merge',
+    cluster_by=['to_date(dl_upd)'],
+    on_schema_change='sync_all_columns'
+) }}
 
+-- Parsed once per changed raw row; downstream models filter on dl_upd, hence the clustering
 with source as (
     select *
     from {{ source('raw', 'raw_lapd_crime_data') }}
+
+    {% if is_incremental() %}
+    where dl_upd > (select max(dl_upd) from {{ this }})
+    {% endif %}
 )
 select
     cast(dr_no as int) as dr_no,
@@ -15,6 +26,8 @@ select
     cast(crm_cd as int) as crm_cd,
     crm_cd_desc,
     mocodes,
+    -- pre-split for the bridge models
+    strtok_to_array(mocodes, ' ') as mocode_array,
     cast(vict_age as integer) as vict_age,
     case
         when vict_sex = 'M' then 'Male'
@@ -33,6 +46,12 @@ select
     cast(crm_cd_2 as int) as crm_cd_2,
     cast(crm_cd_3 as int) as crm_cd_3,
     cast(crm_cd_4 as int) as crm_cd_4,
+    array_construct_compact(
+        cast(crm_cd_1 as int),
+        cast(crm_cd_2 as int),
+        cast(crm_cd_3 as int),
+        cast(crm_cd_4 as int)
+    ) as crime_code_array,
     location,
     cross_street,
     cast(lat as float) as lat,
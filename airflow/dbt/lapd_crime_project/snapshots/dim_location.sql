@@ -4,12 +4,19 @@
         target_schema='mart_core',
         unique_key='id',
         strategy='check',
-        check_cols=['location', 'cross_street', 'lat', 'lon']
+        check_cols=['lat', 'lon'],
+        post_hook=[
+            "{{ create_snapshot_watermark(this, ref('stg_lapd_crime_data'), 'dl_upd') }}",
+            "{{ update_snapshot_watermark(this, ref('stg_lapd_crime_data'), 'dl_upd') }}"
+        ]
     )
 }}
+-- Natural key: location + cross_street (hashed into id). Tracked attributes: lat, lon.
+-- Only staging rows newer than the last run's high-water mark are compared; before the
+-- watermark table exists, fall back to the snapshot's own max source_dlu.
+{% set watermark = load_relation(snapshot_watermark_relation(this)) %}
 with source_date as (
 SELECT
-    distinct
     location,
     cross_street,
     lat,
@@ -17,9 +24,19 @@ SELECT
     dl_upd AS source_dlu,
     CURRENT_TIMESTAMP AS dlu
 FROM {{ ref('stg_lapd_crime_data') }}
+
+{% if watermark is not none %}
+WHERE dl_upd > (SELECT MAX(source_dlu) FROM {{ watermark }})
+{% elif load_relation(this) is not none %}
+WHERE dl_upd > (SELECT MAX(source_dlu) FROM {{ this }})
+{% endif %}
+
+-- keep the latest coordinates per natural key so each id appears once per run;
+-- rows from one load share dl_upd, so dr_no breaks ties deterministically
+QUALIFY ROW_NUMBER() OVER (PARTITION BY location, cross_street ORDER BY dl_upd DESC, dr_no DESC) = 1
 )
 select
-    {{ dbt_utils.generate_surrogate_key(['location', 'cross_street', 'lat', 'lon']) }} AS id,
+    {{ location_key('location', 'cross_street') }} AS id,
     location,
     cross_street,
     lat,
@@ -9,11 +9,16 @@ into Snowflake. It performs the following steps:
 5. Merges the data from the temporary table into a raw table using a MERGE statement with
    logic to handle both inserts and updates based on row-level changes.
 
+By default the single file configured in `GCS_FILE_PATH` is loaded. One or more object
+names can be passed with `--gcs-file-path` instead, which is how the Airflow micro-batch
+DAG hands over newly landed files; they are loaded and merged one at a time in name order.
+
 This script is intended to be used as part of a data pipeline to keep Snowflake data in sync
 with source files stored in GCS. Logging is included for observability and debugging.
 """
 
 import snowflake.connector
+import argparse
 import os
 import logging
 from dotenv import load_dotenv
@@ -28,8 +33,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def load_config():
-    """Load configuration from environment variables."""
+def get_credential(key, env_var):
+    """Read a Snowflake credential from the keyring, falling back to an environment variable."""
+    try:
+        value = keyring.get_password("snowflake", key)
+    except keyring.errors.KeyringError:
+        value = None
+    return value or os.getenv(env_var)
+
+def load_config(gcs_file_paths=None):
+    """Load configuration from environment variables.
+
+    Args:
+        gcs_file_paths (list): Optional GCS object names to load instead of `GCS_FILE_PATH`.
+    """
     load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.env'))
     config = {
         "SNOWFLAKE_ACCOUNT": os.getenv("SNOWFLAKE_ACCOUNT"),
@@ -38,24 +55,29 @@ def load_config():
         "SNOWFLAKE_WAREHOUSE": os.getenv("SNOWFLAKE_WAREHOUSE"),
         "SNOWFLAKE_RAW_TABLE": os.getenv("SNOWFLAKE_RAW_TABLE"),
         "SNOWFLAKE_TEMP_TABLE": os.getenv("SNOWFLAKE_TEMP_TABLE"),
-        "SNOWFLAKE_USER": keyring.get_password("snowflake", "user"),
-        "SNOWFLAKE_PASSWORD": keyring.get_password("snowflake", "pwd"),
+        "SNOWFLAKE_USER": get_credential("user", "SNOWFLAKE_USER"),
+        "SNOWFLAKE_PASSWORD": get_credential("pwd", "SNOWFLAKE_PASSWORD"),
         "GCS_BUCKET_NAME": os.getenv("GCS_BUCKET_NAME"),
         "GCS_FILE_PATH": os.getenv("GCS_FILE_PATH"),
         "SNOWFLAKE_STAGE_NAME": os.getenv("SNOWFLAKE_STAGE_NAME"),
         "SNOWFLAKE_FILE_FORMAT": os.getenv("SNOWFLAKE_FILE_FORMAT"),
         "SNOWFLAKE_STORAGE_INTEGRATION": os.getenv("SNOWFLAKE_STORAGE_INTEGRATION"),
     }
-    missing_config = [key for key, value in config.items() if value is None and key not in ["SNOWFLAKE_FILE_FORMAT", "SNOWFLAKE_STAGE_NAME"]]
+    optional_config = ["SNOWFLAKE_FILE_FORMAT", "SNOWFLAKE_STAGE_NAME"]
+    if gcs_file_paths:
+        optional_config.append("GCS_FILE_PATH")
+    # Compose passes unset variables through as empty strings, so treat those as missing too
+    missing_config = [key for key, value in config.items() if not value and key not in optional_config]
     if missing_config:
         logger.error(f"Missing configuration: {', '.join(missing_config)}")
         raise ValueError(f"Missing configuration for: {', '.join(missing_config)}")
+    config["GCS_FILE_PATHS"] = gcs_file_paths or [config["GCS_FILE_PATH"]]
     logger.info("Configuration successfully loaded.")
     return config
 
-def connect_snowflake():
+def connect_snowflake(config=None):
     """Establishes a connection to Snowflake."""
-    config = load_config()
+    config = config or load_config()
     try:
         conn = snowflake.connector.connect(
             account=config['SNOWFLAKE_ACCOUNT'],
@@ -102,18 +124,16 @@ def create_snowflake_stage(conn, config):
         logger.error(f"Error creating or checking Snowflake stage: {e}")
         raise
 
-def load_from_gcs_to_snowflake_tmp(conn, config):
-    """Loads data from GCS to a Snowflake temporary table using COPY INTO, checking for file existence first."""
+def load_from_gcs_to_snowflake_tmp(conn, config, file_path) -> bool:
+    """Loads one GCS file to a Snowflake temporary table using COPY INTO, checking for file existence first."""
     storage_client = storage.Client()
     bucket = storage_client.bucket(config['GCS_BUCKET_NAME'])
-    blob = bucket.blob(config['GCS_FILE_PATH'])
     # check if the file does not exist
-    if not blob.exists():
-        logger.error(f"GCS file not found: gs://{config['GCS_BUCKET_NAME']}/{config['GCS_FILE_PATH']}")
-        return
-    #stage_name = f"@{config['SNOWFLAKE_DATABASE']}.{config['SNOWFLAKE_SCHEMA']}.{config['SNOWFLAKE_STAGE_NAME']}"
-    file_name = os.path.basename(config['GCS_FILE_PATH'])
-    stage_path = f"@{config['SNOWFLAKE_DATABASE']}.{config['SNOWFLAKE_SCHEMA']}.{config['SNOWFLAKE_STAGE_NAME']}/{file_name}"
+    if not bucket.blob(file_path).exists():
+        logger.error(f"GCS file not found: gs://{config['GCS_BUCKET_NAME']}/{file_path}")
+        return False
+    # The stage points at the bucket root, so object names are paths relative to the stage
+    stage_path = f"@{config['SNOWFLAKE_DATABASE']}.{config['SNOWFLAKE_SCHEMA']}.{config['SNOWFLAKE_STAGE_NAME']}"
     temp_table = config["SNOWFLAKE_TEMP_TABLE"]
     truncate_sql = f"TRUNCATE TABLE {temp_table}"
     df_columns_for_copy = [
@@ -123,17 +143,23 @@ def load_from_gcs_to_snowflake_tmp(conn, config):
         "WEAPON_USED_CD", "WEAPON_DESC", "STATUS", "STATUS_DESC", "CRM_CD_1",
         "CRM_CD_2", "CRM_CD_3", "CRM_CD_4", "LOCATION", "CROSS_STREET", "LAT", "LON"
     ]
+    # Record each row's position in the file, so the MERGE keeps the last row of a repeated DR_NO
+    add_row_number_sql = f"ALTER TABLE {temp_table} ADD COLUMN IF NOT EXISTS FILE_ROW_NUMBER NUMBER"
+    file_columns = ', '.join(f"${position}" for position in range(1, len(df_columns_for_copy) + 1))
     copy_into_sql = f"""
-        COPY INTO {temp_table} ({', '.join(df_columns_for_copy)})
-        FROM {stage_path}
+        COPY INTO {temp_table} ({', '.join(df_columns_for_copy)}, FILE_ROW_NUMBER)
+        FROM (SELECT {file_columns}, METADATA$FILE_ROW_NUMBER FROM {stage_path})
+        FILES = ('{file_path}')
         FILE_FORMAT = (TYPE = CSV FIELD_DELIMITER = ',' SKIP_HEADER = 1 FIELD_OPTIONALLY_ENCLOSED_BY='"');
     """
     try:
         with conn.cursor() as cur:
+            cur.execute(add_row_number_sql)
             cur.execute(truncate_sql)
             logger.info(f"Truncated table: {temp_table}")
             cur.execute(copy_into_sql)
-            logger.info(f"Data loaded from GCS to Snowflake temporary table '{temp_table}'.")
+            logger.info(f"Data loaded from gs://{config['GCS_BUCKET_NAME']}/{file_path} to Snowflake temporary table '{temp_table}'.")
+            return True
     except Exception as e:
         logger.error(f"Error loading data from GCS to Snowflake: {e}")
         try:
@@ -150,7 +176,13 @@ def merge_to_raw_table(conn, config) -> int:
     # ... (rest of the merge_to_raw_table function remains the same)
     merge_sql = f"""
         MERGE INTO {raw_table} AS T
-        USING {temp_table} AS S
+        USING (
+            -- a file may repeat a DR_NO; MERGE needs at most one source row per key,
+            -- and the last row in the file wins
+            SELECT *
+            FROM {temp_table}
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY DR_NO ORDER BY FILE_ROW_NUMBER DESC) = 1
+        ) AS S
         ON T.DR_NO = S.DR_NO
         WHEN MATCHED AND (
             T.DATE_RPTD IS DISTINCT FROM S.DATE_RPTD OR
@@ -233,20 +265,35 @@ def merge_to_raw_table(conn, config) -> int:
         logger.error(f"Error merging data in Snowflake: {e}")
         raise
 
-def main():
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Load LAPD crime CSV files from GCS into Snowflake.")
+    parser.add_argument(
+        "--gcs-file-path",
+        action="append",
+        dest="gcs_file_paths",
+        help="GCS object name to load (repeatable). Defaults to GCS_FILE_PATH.",
+    )
+    return parser.parse_args()
+
+def main(gcs_file_paths=None):
     """Main function to orchestrate the data loading process from GCS to Snowflake."""
-    config = load_config()
-    conn = connect_snowflake()
+    config = load_config(gcs_file_paths)
+    conn = connect_snowflake(config)
     if conn is None:
         logger.error("Exiting due to Snowflake connection error.")
-        return
+        raise SystemExit(1)
     try:
         # Ensure Snowflake stage exists
         create_snowflake_stage(conn, config)
-        # Load data from GCS to Snowflake temporary table
-        load_from_gcs_to_snowflake_tmp(conn, config)
-        # Merge data from temporary table to the raw table
-        merge_to_raw_table(conn, config)
+        # Load and merge one file at a time in name order, so a DR_NO repeated across
+        # overlapping extracts is merged sequentially and the latest file wins
+        for file_path in sorted(config['GCS_FILE_PATHS']):
+            # Load data from GCS to Snowflake temporary table
+            if not load_from_gcs_to_snowflake_tmp(conn, config, file_path):
+                continue
+            # Merge data from temporary table to the raw table
+            merge_to_raw_table(conn, config)
         logger.info("Data load and merge process from GCS to Snowflake complete.")
     finally:
         try:
@@ -256,4 +303,4 @@ def main():
             logger.error(f"Failed to close connection: {close_error}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(parse_args().gcs_file_paths)
\ No newline at end of file